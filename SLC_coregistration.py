@@ -8,9 +8,9 @@ import os
 import glob
 import subprocess
 import configparser
-from datetime import datetime
 import time
 import shutil
+from SLC_index import load_index, acquisition_date, check_inputs
 
 # Load config
 config_file = "/home/cln3/SAR/config.txt"
@@ -24,11 +24,15 @@ snap_exec = parser.get("SoilMoistureMapping_config", "SNAP_version_2")
 master = glob.glob(os.path.join(root, "SLC/2_Step", "*dim"))[0]
 
 # 1. Coregistration
-raw_files = os.listdir(os.path.join(root, "SLC/0_Raw_Image"))
+# Only scenes that passed the SLC_index.py archive checks
+raw_dir = os.path.join(root, "SLC/0_Raw_Image")
+index = load_index(raw_dir)
+raw_files, skipped = check_inputs(raw_dir, index)
+for fname, reason in skipped.items():
+    print(f"Skipping {fname}: {reason}")
 
 for i, fname in enumerate(raw_files):
-    date_str = fname.split('_')[5].split('T')[0]
-    formatted = datetime.strptime(date_str, "%Y%m%d").strftime("%Y_%b_%d")
+    formatted = acquisition_date(fname, index).strftime("%Y_%b_%d")
     
     input_dim = os.path.join(root, "SLC/2_Step", f"{formatted}.dim")
     output_dir = os.path.join(root, "SLC/3_Stack", formatted)
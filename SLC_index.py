@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sentinel-1 SAFE zip metadata index
+
+Reads manifest.safe and the annotation XML straight from each zip in
+SLC/0_Raw_Image (no extraction), checks the archive is complete and writes
+scene_index.json / scene_index.tsv next to the zips for the later stages.
+"""
+import os
+import re
+import sys
+import csv
+import glob
+import json
+import time
+import zipfile
+import logging
+import argparse
+import configparser
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import xml.etree.ElementTree as ET
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+INDEX_JSON = "scene_index.json"
+INDEX_TSV = "scene_index.tsv"
+TSV_COLUMNS = ["file", "valid", "size", "mtime", "date", "start_time", "stop_time", "platform",
+               "absolute_orbit", "relative_orbit", "pass", "datatake_id",
+               "polarisations", "swaths"]
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+NAME_TIME = re.compile(r"(\d{8}T\d{6})")
+# Raw zip folders (relative to root) indexed by default
+RAW_DIRS = ["SLC/0_Raw_Image", "Sentinel1/0_GRD_Raw_Image", "Sentinel1/1_Slice_Assembly"]
+
+def load_config(config_file_path):
+    """Load configuration parameters from config file."""
+    parser = configparser.ConfigParser()
+    parser.read(config_file_path)
+    config = {
+        "root": parser.get("SoilMoistureMapping_config", "root")
+    }
+    return config
+
+def _local(tag):
+    """Strip the XML namespace from a tag ('{ns}startTime' -> 'startTime')."""
+    return tag.rsplit('}', 1)[-1]
+
+def _find(node, name):
+    """First descendant of node with the given local name, or None."""
+    if node is None:
+        return None
+    for el in node.iter():
+        if _local(el.tag) == name:
+            return el
+    return None
+
+def _text(node, name):
+    el = _find(node, name)
+    return el.text.strip() if el is not None and el.text else None
+
+def _int(value):
+    return int(value) if value is not None else None
+
+def parse_time(value):
+    """Parse a SAFE UTC timestamp ('2024-01-04T16:05:37.123456')."""
+    if '.' not in value:
+        value += '.0'
+    return datetime.strptime(value, TIME_FORMAT)
+
+def parse_manifest(xml_bytes):
+    """Extract platform, orbit, datatake, polarisation and timing from manifest.safe."""
+    tree = ET.fromstring(xml_bytes)
+    meta = {"polarisations": [], "swaths": []}
+
+    platform = _find(tree, "platform")
+    if platform is not None:
+        meta["platform"] = (_text(platform, "familyName") or "") + (_text(platform, "number") or "")
+
+    for el in tree.iter():
+        name = _local(el.tag)
+        value = el.text.strip() if el.text else None
+        if name == "orbitNumber" and el.get("type") == "start":
+            meta["absolute_orbit"] = _int(value)
+        elif name == "relativeOrbitNumber" and el.get("type") == "start":
+            meta["relative_orbit"] = _int(value)
+        elif name == "pass":
+            meta["pass"] = value
+        elif name == "missionDataTakeID":
+            meta["datatake_id"] = _int(value)
+        elif name == "transmitterReceiverPolarisation":
+            meta["polarisations"].append(value)
+        elif name == "swath" and value not in meta["swaths"]:
+            meta["swaths"].append(value)
+        elif name == "mode":
+            meta["mode"] = value
+        elif name == "productType":
+            meta["product_type"] = value
+        elif name == "sliceNumber":
+            meta["slice_number"] = _int(value)
+        elif name == "totalSlices":
+            meta["total_slices"] = _int(value)
+        elif name == "coordinates" and value:
+            meta["footprint"] = [[float(v) for v in pair.split(',')] for pair in value.split()]
+
+    period = _find(tree, "acquisitionPeriod")
+    if period is not None:
+        meta["start_time"] = _text(period, "startTime")
+        meta["stop_time"] = _text(period, "stopTime")
+    return meta
+
+def parse_annotation(xml_bytes):
+    """Extract swath timing and burst geometry from an annotation XML."""
+    tree = ET.fromstring(xml_bytes)
+    header = _find(tree, "adsHeader")
+    info = _find(tree, "imageInformation")
+    timing = _find(tree, "swathTiming")
+    bursts = [_text(b, "azimuthTime") for b in tree.iter() if _local(b.tag) == "burst"]
+    return {
+        "swath": _text(header, "swath"),
+        "polarisation": _text(header, "polarisation"),
+        "start_time": _text(header, "startTime"),
+        "stop_time": _text(header, "stopTime"),
+        "lines_per_burst": _int(_text(timing, "linesPerBurst")),
+        "samples_per_burst": _int(_text(timing, "samplesPerBurst")),
+        "number_of_lines": _int(_text(info, "numberOfLines")),
+        "number_of_samples": _int(_text(info, "numberOfSamples")),
+        "burst_count": len(bursts),
+        "burst_azimuth_times": bursts,
+    }
+
+def manifest_byte_streams(xml_bytes):
+    """Map each file listed in manifest.safe (relative href) to its declared size."""
+    tree = ET.fromstring(xml_bytes)
+    streams = {}
+    for stream in tree.iter():
+        if _local(stream.tag) != "byteStream":
+            continue
+        location = _find(stream, "fileLocation")
+        if location is None or stream.get("size") is None:
+            continue
+        href = location.get("href", "")
+        if href.startswith("./"):
+            href = href[2:]
+        streams[href] = int(stream.get("size"))
+    return streams
+
+def check_archive(zf, archive_size, safe_dir, manifest_bytes):
+    """
+    Cheap completeness checks that need only the central directory:
+    every member must lie inside the file, and every file listed in the
+    manifest must be present with the declared size.
+    """
+    errors = []
+    members = {}
+    for info in zf.infolist():
+        members[info.filename] = info
+        if info.header_offset + info.compress_size > archive_size:
+            errors.append(f"Member extends past end of archive: {info.filename}")
+
+    for href, size in manifest_byte_streams(manifest_bytes).items():
+        info = members.get(safe_dir + href)
+        if info is None:
+            errors.append(f"Missing from archive: {href}")
+        elif info.file_size != size:
+            errors.append(f"Size mismatch for {href}: {info.file_size} != {size} (manifest)")
+    return errors
+
+def index_scene(zip_path, verify_data=False):
+    """
+    Build the index record for one SAFE zip. The CRC of manifest.safe and of
+    the annotation files is checked as they are read; verify_data=True also
+    CRC-checks the measurement rasters (reads the whole archive). Any failure
+    is recorded in the record's errors rather than raised.
+    """
+    record = {
+        "file": os.path.basename(zip_path),
+        "size": None,
+        "mtime": None,
+        "verify_data": verify_data,
+        "valid": False,
+        "errors": [],
+    }
+    try:
+        stat = os.stat(zip_path)
+        record["size"] = stat.st_size
+        record["mtime"] = stat.st_mtime
+        with zipfile.ZipFile(zip_path) as zf:
+            manifests = [n for n in zf.namelist() if n.endswith(".SAFE/manifest.safe")]
+            if not manifests:
+                record["errors"].append("manifest.safe not found")
+                return record
+            safe_dir = manifests[0][:-len("manifest.safe")]
+
+            manifest_bytes = zf.read(manifests[0])
+            record.update(parse_manifest(manifest_bytes))
+            record["errors"].extend(check_archive(zf, stat.st_size, safe_dir, manifest_bytes))
+
+            # Burst geometry is shared between polarisations, so one annotation per swath is enough
+            annotations = {}
+            for name in sorted(zf.namelist()):
+                if os.path.dirname(name) != safe_dir + "annotation" or not name.endswith(".xml"):
+                    continue
+                swath = os.path.basename(name).split('-')[1].upper()
+                if swath not in annotations:
+                    annotations[swath] = parse_annotation(zf.read(name))
+            record["annotations"] = [annotations[s] for s in sorted(annotations)]
+            if not record["swaths"]:
+                record["swaths"] = sorted(annotations)
+
+            if verify_data:
+                bad = zf.testzip()
+                if bad is not None:
+                    record["errors"].append(f"CRC mismatch: {bad}")
+
+        if record.get("start_time"):
+            record["date"] = parse_time(record["start_time"]).strftime("%Y%m%d")
+        else:
+            record["errors"].append("No acquisition start time in manifest")
+    except Exception as e:
+        record["errors"].append(f"{type(e).__name__}: {e}")
+
+    record["valid"] = not record["errors"]
+    return record
+
+def _is_current(record, stat):
+    """True if an index record still describes the zip on disk (same size and mtime)."""
+    return record.get("size") == stat.st_size and record.get("mtime") == stat.st_mtime
+
+def build_index(raw_dir, workers=None, verify_data=False, previous=None):
+    """
+    Index every zip in raw_dir with a process pool. Entries from a previous
+    index are reused when the zip's size and mtime are unchanged (and, with
+    verify_data, only if they were CRC-checked in full last time).
+    """
+    previous = previous or {}
+    zip_paths = sorted(glob.glob(os.path.join(raw_dir, "*.zip")))
+    index = {}
+    todo = []
+    for path in zip_paths:
+        name = os.path.basename(path)
+        old = previous.get(name)
+        if old and _is_current(old, os.stat(path)) and (old.get("verify_data") or not verify_data):
+            index[name] = old
+        else:
+            todo.append(path)
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(index_scene, path, verify_data): path for path in todo}
+            for future in as_completed(futures):
+                path = futures[future]
+                name = os.path.basename(path)
+                try:
+                    index[name] = future.result()
+                except Exception as e:
+                    # A crashed worker only invalidates its own scene
+                    index[name] = {"file": name, "size": None, "mtime": None,
+                                   "verify_data": verify_data, "valid": False,
+                                   "errors": [f"{type(e).__name__}: {e}"]}
+    return {name: index[name] for name in sorted(index)}
+
+def write_index(index, raw_dir):
+    """Write the full index as JSON and a flat summary as TSV (for the R/Julia stages)."""
+    with open(os.path.join(raw_dir, INDEX_JSON), "w") as f:
+        json.dump(index, f, indent=1)
+
+    with open(os.path.join(raw_dir, INDEX_TSV), "w", newline="") as f:
+        writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+        writer.writerow(TSV_COLUMNS)
+        for record in index.values():
+            row = []
+            for col in TSV_COLUMNS:
+                value = record.get(col, "")
+                if isinstance(value, list):
+                    value = ",".join(value)
+                elif isinstance(value, bool):
+                    value = str(value).lower()
+                row.append("" if value is None else value)
+            writer.writerow(row)
+
+def load_index(raw_dir):
+    """Load scene_index.json from raw_dir, or an empty index if it does not exist."""
+    path = os.path.join(raw_dir, INDEX_JSON)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def acquisition_date(filename, index=None):
+    """
+    Acquisition start of a scene as a datetime. Uses the manifest start time
+    from the index when available, otherwise the product name
+    (S1A_IW_SLC__1SDV_20240104T160537_...).
+    """
+    base_name = os.path.basename(filename)
+    record = (index or {}).get(base_name)
+    if record and record.get("start_time"):
+        return parse_time(record["start_time"])
+    m = NAME_TIME.search(base_name)
+    if m is None:
+        logging.error(f"Could not extract acquisition date from {filename}")
+        return None
+    return datetime.strptime(m.group(1), "%Y%m%dT%H%M%S")
+
+def check_inputs(raw_dir, index=None):
+    """
+    Split the zips currently in raw_dir into (usable, skipped). A zip is
+    skipped if it is missing from the index, changed since it was indexed,
+    or failed the archive checks; skipped maps file name -> reason.
+    """
+    index = load_index(raw_dir) if index is None else index
+    usable = []
+    skipped = {}
+    for path in sorted(glob.glob(os.path.join(raw_dir, "*.zip"))):
+        name = os.path.basename(path)
+        record = index.get(name)
+        if record is None:
+            skipped[name] = "not in scene index (run SLC_index.py)"
+        elif not _is_current(record, os.stat(path)):
+            skipped[name] = "changed since indexing (run SLC_index.py)"
+        elif not record.get("valid"):
+            skipped[name] = "; ".join(record.get("errors", [])) or "invalid"
+        else:
+            usable.append(name)
+    return usable, skipped
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Index Sentinel-1 SAFE zips without extracting them.")
+    arg_parser.add_argument("raw_dirs", nargs="*",
+                            help="Folders of SAFE zips (default: the raw folders under root in config.txt)")
+    arg_parser.add_argument("--verify-data", action="store_true",
+                            help="Also CRC-check the measurement rasters (reads every archive in full)")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    args = arg_parser.parse_args()
+
+    raw_dirs = args.raw_dirs
+    if not raw_dirs:
+        config_file_path = "/home/cln3/SAR/config.txt"
+        config = load_config(config_file_path)
+        raw_dirs = [os.path.join(config["root"], d) for d in RAW_DIRS]
+        raw_dirs = [d for d in raw_dirs if glob.glob(os.path.join(d, "*.zip"))]
+    if not raw_dirs:
+        logging.error("No folders with zip files to index")
+        sys.exit(1)
+
+    for raw_dir in raw_dirs:
+        start = time.time()
+        index = build_index(raw_dir, workers=args.workers, verify_data=args.verify_data,
+                            previous=load_index(raw_dir))
+        write_index(index, raw_dir)
+
+        corrupt = [name for name, record in index.items() if not record.get("valid")]
+        for name in corrupt:
+            logging.error(f"Corrupt or incomplete: {name}: {'; '.join(index[name]['errors'])}")
+        logging.info(f"Indexed {len(index)} scenes in {raw_dir} ({len(corrupt)} corrupt) "
+                     f"in {time.time() - start:.1f} seconds")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ using XMLDict
 using Distributed
 using Logging
 using Printf
+using DelimitedFiles
 
 # Constants
 const BASE_DIR = expanduser("~/SAR/Sentinel1/SLC")
@@ -16,6 +17,7 @@ const CORES = min(4, Sys.CPU_THREADS)
 const SNAP_BIN = "/home/cln3/esa-snap/bin/gpt"
 const MEMORY_PER_CORE = "24G"
 const LOG_FILE = joinpath(BASE_DIR, "processing_errors.log")
+const SCENE_INDEX = joinpath(ZIP_DIR, "scene_index.tsv")  # written by SLC_index.py
 
 # Stage 2 Constants
 const STAGE2_GRAPH = joinpath(BASE_DIR, "Base_Graph", "SLC_preprocess_B.xml")
@@ -33,13 +35,50 @@ function create_directories()
     end
 end
 
+function load_scene_index()
+    isfile(SCENE_INDEX) || return Dict{String,Dict{String,String}}()
+    cells, header = readdlm(SCENE_INDEX, '\t', String; header=true)
+    columns = vec(header)
+    return Dict(row[1] => Dict(zip(columns, row)) for row in eachrow(cells))
+end
+
+const SCENES = load_scene_index()
+
+# Same rule as SLC_index.check_inputs: skip zips that are unindexed, changed since indexing, or invalid
+function skip_reason(file)
+    scene = get(SCENES, basename(file), nothing)
+    scene === nothing && return "not in scene index (run SLC_index.py)"
+    size = tryparse(Int, scene["size"])
+    stamp = tryparse(Float64, scene["mtime"])
+    if size != filesize(file) || stamp === nothing || abs(stamp - mtime(file)) > 1e-3
+        return "changed since indexing (run SLC_index.py)"
+    end
+    scene["valid"] != "true" && return "failed archive checks (see $SCENE_INDEX)"
+    return nothing
+end
+
 function get_input_files()
     files = glob("*.zip", ZIP_DIR)
     isempty(files) && error("No input files found in $ZIP_DIR")
-    return files
+    usable = String[]
+    for f in files
+        reason = skip_reason(f)
+        if reason === nothing
+            push!(usable, f)
+        else
+            @warn "Skipping $(basename(f)): $reason"
+        end
+    end
+    isempty(usable) && error("No valid input files in $ZIP_DIR (see $SCENE_INDEX)")
+    return usable
 end
 
 function format_date_from_filename(filename)
+    scene = get(SCENES, filename, nothing)
+    if scene !== nothing && !isempty(scene["date"])
+        return Dates.format(Date(scene["date"], "yyyymmdd"), "YYYY_uuu_dd")
+    end
+
     m = match(r"\d{8}", filename)
     m === nothing && error("Could not extract date from filename: $filename")
     
@@ -18,6 +18,7 @@ from datetime import datetime
 
 # Add the project directory to the system path
 sys.path.insert(0, '/home/cln3/SAR/')
+from SLC_index import check_inputs
 
 #####################################################################################
 # Load Paths from Config File
@@ -44,6 +45,8 @@ SNAP_version_1 = parser.get("SoilMoistureMapping_config", "SNAP_version_1")  # S
 # List all raw image files in the input directory
 input_folder = os.path.join(root, "Sentinel1/0_GRD_Raw_Image")
 input_files = sorted([f for f in os.listdir(input_folder) if f.endswith('.zip')])
+# Zips that failed the SLC_index.py archive checks (pairs are kept in place so slices still line up)
+_, skipped = check_inputs(input_folder)
 
 # Output directory for processed images
 output_folder = os.path.join(root, "Sentinel1/1_Slice_Assembly")
@@ -55,6 +58,12 @@ for i in range(0, len(input_files), 2):
         print(f"Skipping {input_files[i]} as it doesn't have a pair for slice assembly")
         continue
         
+    bad = [f for f in input_files[i:i+2] if f in skipped]
+    if bad:
+        for f in bad:
+            print(f"Skipping pair with {f}: {skipped[f]}")
+        continue
+
     input1 = os.path.join(input_folder, input_files[i])
     input2 = os.path.join(input_folder, input_files[i+1])
     
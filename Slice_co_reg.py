@@ -15,6 +15,7 @@ import logging
 
 # Add SAR directory to Python path
 sys.path.insert(0, '/home/cln3/SAR/')
+from SLC_index import acquisition_date
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -49,8 +50,8 @@ def get_date_from_filename(filename):
         # Handle both formats: original S1A... names and YYYY_Mmm_DD names
         if base_name.startswith('S1'):
             # Original format: S1A_IW_GRDH_1SDV_20181107T031553_20181107T031618_024476_02AEFD_741A_TC.dim
-            date_str = base_name.split('_')[5][:8]  # Get YYYYMMDD from timestamp
-            return datetime.strptime(date_str, "%Y%m%d")
+            acquired = acquisition_date(base_name)
+            return datetime(acquired.year, acquired.month, acquired.day) if acquired else None
         else:
             # New format: YYYY_Mmm_DD.dim
             date_part = base_name[:11]  # First 11 characters (YYYY_Mmm_DD)
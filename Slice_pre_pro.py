@@ -18,6 +18,7 @@ from datetime import datetime
 
 # Add the project directory to the system path
 sys.path.insert(0, '/home/cln3/SAR/')
+from SLC_index import check_inputs
 
 #####################################################################################
 # Load Paths from Config File
@@ -43,8 +44,11 @@ def process_slice_assembly_outputs():
     output_folder = os.path.join(root, "Sentinel1/1_Processed_Image")
     os.makedirs(output_folder, exist_ok=True)
 
-    # Get input files
-    input_files = sorted([f for f in os.listdir(input_folder) if f.endswith(('.dim', '.zip'))])
+    # Get input files: .dim outputs from Slice_Assembly.py, plus zips that passed the SLC_index.py archive checks
+    input_zips, skipped = check_inputs(input_folder)
+    for fname, reason in skipped.items():
+        print(f"Skipping {fname}: {reason}")
+    input_files = sorted([f for f in os.listdir(input_folder) if f.endswith('.dim')] + input_zips)
     total_files = len(input_files)
     
     if not input_files:
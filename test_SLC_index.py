@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for SLC_index.py using small synthetic SAFE zips
+"""
+import os
+import zipfile
+
+import SLC_index
+
+SAFE = "S1A_IW_SLC__1SDV_20240104T160537_20240104T160604_051955_0646F4_ABCD.SAFE/"
+ANNOTATION = "annotation/s1a-iw1-slc-vv-20240104t160537-20240104t160604-051955-0646f4-004.xml"
+MEASUREMENT = "measurement/s1a-iw1-slc-vv-20240104t160537-20240104t160604-051955-0646f4-004.tiff"
+
+ANNOTATION_XML = b"""<product>
+<adsHeader><swath>IW1</swath><polarisation>VV</polarisation>
+<startTime>2024-01-04T16:05:37.100000</startTime><stopTime>2024-01-04T16:06:04.200000</stopTime></adsHeader>
+<imageAnnotation><imageInformation><numberOfSamples>21000</numberOfSamples><numberOfLines>13500</numberOfLines></imageInformation></imageAnnotation>
+<swathTiming><linesPerBurst>1500</linesPerBurst><samplesPerBurst>21000</samplesPerBurst>
+<burstList count="2"><burst><azimuthTime>2024-01-04T16:05:38.000000</azimuthTime></burst>
+<burst><azimuthTime>2024-01-04T16:05:40.750000</azimuthTime></burst></burstList></swathTiming>
+</product>"""
+
+MEASUREMENT_DATA = bytes(range(256)) * 400
+
+
+def manifest_xml(sizes):
+    streams = "".join(
+        f'<dataObject><byteStream size="{size}"><fileLocation locatorType="URL" href="./{href}"/>'
+        f'</byteStream></dataObject>'
+        for href, size in sizes.items())
+    return f"""<xfdu:XFDU xmlns:xfdu="urn:ccsds:schema:xfdu:1" xmlns:safe="http://www.esa.int/safe/sentinel-1.0"
+ xmlns:s1="http://www.esa.int/safe/sentinel-1.0/sentinel-1"
+ xmlns:s1sarl1="http://www.esa.int/safe/sentinel-1.0/sentinel-1/sar/level-1" xmlns:gml="http://www.opengis.net/gml">
+<metadataSection><metadataObject><metadataWrap><xmlData>
+<safe:platform><safe:familyName>SENTINEL-1</safe:familyName><safe:number>A</safe:number></safe:platform>
+<safe:orbitReference><safe:orbitNumber type="start">51955</safe:orbitNumber>
+<safe:relativeOrbitNumber type="start">6</safe:relativeOrbitNumber>
+<safe:extension><s1:orbitProperties><s1:pass>ASCENDING</s1:pass></s1:orbitProperties></safe:extension></safe:orbitReference>
+<safe:acquisitionPeriod><safe:startTime>2024-01-04T16:05:37.123456</safe:startTime>
+<safe:stopTime>2024-01-04T16:06:04.000000</safe:stopTime></safe:acquisitionPeriod>
+<s1sarl1:standAloneProductInformation><s1sarl1:missionDataTakeID>411380</s1sarl1:missionDataTakeID>
+<s1sarl1:transmitterReceiverPolarisation>VV</s1sarl1:transmitterReceiverPolarisation>
+<s1sarl1:transmitterReceiverPolarisation>VH</s1sarl1:transmitterReceiverPolarisation></s1sarl1:standAloneProductInformation>
+<safe:measurementFrame><safe:footPrint><gml:coordinates>-15.1,34.2 -16.0,34.5</gml:coordinates></safe:footPrint></safe:measurementFrame>
+</xmlData></metadataWrap></metadataObject></metadataSection>
+<dataObjectSection>{streams}</dataObjectSection></xfdu:XFDU>"""
+
+
+def make_safe_zip(path, members=None, sizes=None):
+    """Write a minimal SAFE zip; members/sizes override the archive contents and manifest sizes."""
+    if members is None:
+        members = {ANNOTATION: ANNOTATION_XML, MEASUREMENT: MEASUREMENT_DATA}
+    if sizes is None:
+        sizes = {name: len(data) for name, data in members.items()}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(SAFE + "manifest.safe", manifest_xml(sizes))
+        for name, data in members.items():
+            zf.writestr(SAFE + name, data)
+    return str(path)
+
+
+def corrupt_member(path, member):
+    """Overwrite the start of one member's deflate stream (an invalid block header -> zlib.error)."""
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(SAFE + member)
+    with open(path, "r+b") as f:
+        f.seek(info.header_offset + 26)
+        name_len = int.from_bytes(f.read(2), "little")
+        extra_len = int.from_bytes(f.read(2), "little")
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        f.write(b"\xff" * 16)
+
+
+def test_good_zip(tmp_path):
+    record = SLC_index.index_scene(make_safe_zip(tmp_path / "good.zip"))
+    assert record["valid"], record["errors"]
+    assert record["platform"] == "SENTINEL-1A"
+    assert record["absolute_orbit"] == 51955
+    assert record["relative_orbit"] == 6
+    assert record["pass"] == "ASCENDING"
+    assert record["datatake_id"] == 411380
+    assert record["polarisations"] == ["VV", "VH"]
+    assert record["swaths"] == ["IW1"]
+    assert record["date"] == "20240104"
+    annotation = record["annotations"][0]
+    assert annotation["burst_count"] == 2
+    assert annotation["lines_per_burst"] == 1500
+    assert SLC_index.acquisition_date("good.zip", {"good.zip": record}).microsecond == 123456
+
+
+def test_truncated_zip(tmp_path):
+    path = make_safe_zip(tmp_path / "truncated.zip")
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) // 2)
+    record = SLC_index.index_scene(path)
+    assert not record["valid"]
+    assert record["errors"][0].startswith("BadZipFile")
+
+
+def test_missing_member(tmp_path):
+    sizes = {ANNOTATION: len(ANNOTATION_XML), MEASUREMENT: len(MEASUREMENT_DATA)}
+    path = make_safe_zip(tmp_path / "missing.zip", members={ANNOTATION: ANNOTATION_XML}, sizes=sizes)
+    record = SLC_index.index_scene(path)
+    assert not record["valid"]
+    assert record["errors"] == [f"Missing from archive: {MEASUREMENT}"]
+
+
+def test_size_mismatch(tmp_path):
+    sizes = {ANNOTATION: len(ANNOTATION_XML), MEASUREMENT: len(MEASUREMENT_DATA) + 1}
+    record = SLC_index.index_scene(make_safe_zip(tmp_path / "size.zip", sizes=sizes))
+    assert not record["valid"]
+    assert record["errors"][0].startswith(f"Size mismatch for {MEASUREMENT}")
+
+
+def test_corrupted_annotation_is_flagged_not_raised(tmp_path):
+    path = make_safe_zip(tmp_path / "corrupt.zip")
+    corrupt_member(path, ANNOTATION)
+    record = SLC_index.index_scene(path)
+    assert not record["valid"]
+    assert record["errors"][0].startswith("error: Error -3")
+
+    index = SLC_index.build_index(str(tmp_path), workers=1)
+    assert not index["corrupt.zip"]["valid"]
+
+
+def test_corrupted_measurement_needs_verify_data(tmp_path):
+    path = make_safe_zip(tmp_path / "corrupt.zip")
+    corrupt_member(path, MEASUREMENT)
+    assert SLC_index.index_scene(path)["valid"]
+
+    record = SLC_index.index_scene(path, verify_data=True)
+    assert not record["valid"]
+    assert record["errors"][0].startswith("error: Error -3")
+    assert record["verify_data"]
+
+
+def test_reuse_unchanged_entries(tmp_path, monkeypatch):
+    make_safe_zip(tmp_path / "a.zip")
+    make_safe_zip(tmp_path / "b.zip")
+    previous = SLC_index.build_index(str(tmp_path), workers=1)
+    os.utime(tmp_path / "b.zip", (0, 0))
+
+    indexed = []
+    real_index_scene = SLC_index.index_scene
+
+    def tracking_index_scene(path, verify_data=False):
+        indexed.append(os.path.basename(path))
+        return real_index_scene(path, verify_data)
+
+    # ProcessPoolExecutor can't see the patch, so run the pool in-process
+    class InlinePool:
+        def __init__(self, max_workers=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, *args):
+            from concurrent.futures import Future
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+
+    monkeypatch.setattr(SLC_index, "index_scene", tracking_index_scene)
+    monkeypatch.setattr(SLC_index, "ProcessPoolExecutor", InlinePool)
+
+    index = SLC_index.build_index(str(tmp_path), previous=previous)
+    assert indexed == ["b.zip"]
+    assert index["a.zip"] is previous["a.zip"]
+
+    # Entries indexed without verify_data are re-checked when it is requested
+    indexed.clear()
+    SLC_index.build_index(str(tmp_path), verify_data=True, previous=index)
+    assert indexed == ["a.zip", "b.zip"]
+
+
+def test_check_inputs(tmp_path):
+    make_safe_zip(tmp_path / "good.zip")
+    make_safe_zip(tmp_path / "changed.zip")
+    index = SLC_index.build_index(str(tmp_path), workers=1)
+    SLC_index.write_index(index, str(tmp_path))
+    make_safe_zip(tmp_path / "new.zip")
+    os.utime(tmp_path / "changed.zip", (0, 0))
+
+    usable, skipped = SLC_index.check_inputs(str(tmp_path))
+    assert usable == ["good.zip"]
+    assert sorted(skipped) == ["changed.zip", "new.zip"]